@@ -3,17 +3,26 @@ import feedparser
 import sqlite3
 import curses
 import html2text
+from html import unescape
 import os
+import fcntl
 import subprocess
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import dateutil.parser   # Per fare il parsing delle date in formati diversi
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selectolax.lexbor import LexborHTMLParser
 import argparse
 import time
 import json
+import re
 import gzip
+import contextlib
+import itertools
+import functools
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Ottieni il percorso della directory dello script
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -26,6 +35,9 @@ ARCHIVE_DIR = os.path.join(SCRIPT_DIR, "archive")
 PRINTER_NAME = "Canon"  # Nome della stampante configurata in CUPS
 CACHE_DURATION_HOURS = 24  # Intervallo di tempo per ricaricare gli articoli (in ore)
 ARCHIVE_THRESHOLD_DAYS = 30  # Soglia in giorni per archiviare gli articoli
+FETCH_WORKERS = 8  # Numero massimo di download in parallelo (feed e articoli)
+MAX_ARTICLE_BYTES = 2_000_000  # Dimensione massima scaricata per ogni pagina di articolo
+FEED_HEAD_BYTES = 32 * 1024  # Byte letti da un nuovo feed per ricavarne il titolo
 
 # Configurazione del logging
 logging.basicConfig(
@@ -38,60 +50,120 @@ logging.basicConfig(
 # FUNZIONI PER IL DATABASE
 # ----------------------------------------------------------------------------
 
+def connect_db(db_name):
+    """
+    Apre una connessione al database SQLite applicando le PRAGMA di performance
+    che valgono per la singola connessione (il journal WAL è invece persistente
+    e viene impostato in initialize_db).
+    """
+    conn = sqlite3.connect(db_name)
+    conn.execute('PRAGMA synchronous=NORMAL')  # Sicuro in modalità WAL, evita un fsync per commit
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-65536')  # 64 MiB
+    conn.execute('PRAGMA mmap_size=268435456')  # 256 MiB
+    return conn
+
+@functools.lru_cache(maxsize=None)
+def get_connection(db_name):
+    """
+    Restituisce la connessione persistente al database 'db_name': viene aperta
+    alla prima richiesta e riutilizzata da tutte le funzioni per l'intera durata
+    del programma, evitando di riaprire il file e riapplicare le PRAGMA a ogni schermata.
+    """
+    return connect_db(db_name)
+
 def initialize_db(db_name=DB_PATH):
     """
     Inizializza il database SQLite creando le tabelle necessarie.
     """
-    conn = sqlite3.connect(db_name)
+    conn = get_connection(db_name)
     c = conn.cursor()
-    # Crea la tabella 'sources' se non esiste
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS sources (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT,
-            url TEXT UNIQUE
-        )
-    ''')
-    # Crea la tabella 'articles' se non esiste, includendo 'source_id'
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS articles (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT,
-            link TEXT UNIQUE,
-            published TEXT,
-            content TEXT,
-            scraped_at TEXT,
-            source_id INTEGER,
-            FOREIGN KEY(source_id) REFERENCES sources(id)
-        )
-    ''')
-    # Crea la tabella 'tags' se non esiste
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS tags (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            tag TEXT UNIQUE
-        )
-    ''')
-    # Crea la tabella 'article_tags' se non esiste
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS article_tags (
-            article_id INTEGER,
-            tag_id INTEGER,
-            FOREIGN KEY(article_id) REFERENCES articles(id),
-            FOREIGN KEY(tag_id) REFERENCES tags(id),
-            PRIMARY KEY (article_id, tag_id)
-        )
-    ''')
-    conn.commit()
-    conn.close()
+    # Abilita il Write-Ahead Logging (resta attivo sul file del database).
+    # SQLite restituisce la modalità effettiva: su alcuni filesystem (es. di rete) WAL non è disponibile
+    journal_mode = c.execute('PRAGMA journal_mode=WAL').fetchone()[0]
+    if journal_mode.lower() != 'wal':
+        logging.warning(f"WAL journal mode not available, using '{journal_mode}'")
+    # Schema e migrazioni: commit all'uscita dal blocco, rollback in caso di errore
+    with conn:
+        # Crea la tabella 'sources' se non esiste
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS sources (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT,
+                url TEXT UNIQUE
+            )
+        ''')
+        # Crea la tabella 'articles' se non esiste, includendo 'source_id'
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT,
+                link TEXT UNIQUE,
+                published TEXT,
+                content TEXT,
+                scraped_at TEXT,
+                source_id INTEGER,
+                FOREIGN KEY(source_id) REFERENCES sources(id)
+            )
+        ''')
+        # Crea la tabella 'tags' se non esiste
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS tags (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                tag TEXT UNIQUE
+            )
+        ''')
+        # Crea la tabella 'article_tags' se non esiste
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS article_tags (
+                article_id INTEGER,
+                tag_id INTEGER,
+                FOREIGN KEY(article_id) REFERENCES articles(id),
+                FOREIGN KEY(tag_id) REFERENCES tags(id),
+                PRIMARY KEY (article_id, tag_id)
+            )
+        ''')
+        # Indici per la visualizzazione per fonte e per l'archiviazione per data (range su 'published')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_articles_source_published ON articles(source_id, published DESC)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_articles_published ON articles(published)')
+        # Indice di copertura per la ricerca degli articoli a partire dai tag
+        c.execute('CREATE INDEX IF NOT EXISTS idx_article_tags_tag_article ON article_tags(tag_id, article_id)')
+        if c.execute('PRAGMA user_version').fetchone()[0] < 1:
+            migrate_published_dates(c)
+            c.execute('PRAGMA user_version = 1')
     logging.info("Database initialized.")
 
-def save_source(db_name, name, url):
+def migrate_published_dates(c):
+    """
+    Migrazione 1: riscrive in ISO 8601 (UTC) le date 'published' salvate nel
+    formato originale del feed (es. RFC 822).
+    Attenzione, modifica i dati esistenti: le date mostrate nell'interfaccia e
+    scritte negli archivi JSON diventano ISO UTC, e gli articoli che prima
+    l'archiviazione ignorava (date non riconosciute da SQLite) diventano
+    archiviabili, per cui il primo --archive esporta e rimuove anche quelli
+    più vecchi della soglia.
+    """
+    c.execute("SELECT id, published FROM articles WHERE published != '' AND datetime(published) IS NULL")
+    rows = [(to_iso_date(published), id_) for id_, published in c.fetchall()]
+    c.executemany('UPDATE articles SET published = ? WHERE id = ?', rows)
+    logging.info(f"Migrated {len(rows)} article dates to ISO 8601")
+
+@contextlib.contextmanager
+def db_transaction(db_name):
+    """
+    Esegue un'operazione puntuale (es. dall'interfaccia) sulla connessione persistente:
+    commit all'uscita dal blocco 'with', rollback in caso di errore.
+    """
+    conn = get_connection(db_name)
+    with conn:
+        yield conn
+
+def save_source(conn, name, url):
     """
-    Salva una fonte RSS nel database.
+    Salva una fonte RSS nel database usando la connessione fornita.
     Se la fonte esiste già, restituisce il suo ID.
+    Il commit è a carico del chiamante.
     """
-    conn = sqlite3.connect(db_name)
     c = conn.cursor()
     try:
         c.execute('INSERT INTO sources (name, url) VALUES (?, ?)', (name, url))
@@ -106,105 +178,118 @@ def save_source(db_name, name, url):
             logging.info(f"Source already exists: {name} ({url})")
         else:
             source_id = None
-    conn.commit()
-    conn.close()
     return source_id
 
-def update_source_name(db_name, source_id, new_name):
+def update_source_name(conn, source_id, new_name):
     """
-    Aggiorna il nome di una fonte RSS.
+    Aggiorna il nome di una fonte RSS usando la connessione fornita.
+    Il commit è a carico del chiamante.
     """
-    conn = sqlite3.connect(db_name)
-    c = conn.cursor()
-    c.execute('UPDATE sources SET name = ? WHERE id = ?', (new_name, source_id))
-    conn.commit()
-    conn.close()
+    conn.execute('UPDATE sources SET name = ? WHERE id = ?', (new_name, source_id))
     logging.info(f"Source ID {source_id} renamed to {new_name}")
 
-def delete_source(db_name, source_id):
+def delete_source(conn, source_id):
     """
-    Elimina una fonte RSS dal database.
+    Elimina una fonte RSS dal database usando la connessione fornita.
+    Il commit è a carico del chiamante.
     """
-    conn = sqlite3.connect(db_name)
-    c = conn.cursor()
-    c.execute('DELETE FROM sources WHERE id = ?', (source_id,))
-    conn.commit()
-    conn.close()
+    conn.execute('DELETE FROM sources WHERE id = ?', (source_id,))
     logging.info(f"Source ID {source_id} deleted")
 
-def save_article(db_name, title, link, published, content, source_id, scraped_now=False):
-    """
-    Salva un articolo nel database.
-    Evita il salvataggio duplicato controllando il campo 'link' come UNIQUE.
-    Aggiorna 'content' e 'scraped_at' se 'scraped_now' è True.
-    """
-    conn = sqlite3.connect(db_name)
-    c = conn.cursor()
-    
-    try:
-        if scraped_now:
-            c.execute('''
-                INSERT INTO articles (title, link, published, content, scraped_at, source_id) 
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (title, link, published, content, datetime.utcnow().isoformat(), source_id))
-            article_id = c.lastrowid
-            logging.info(f"Article saved and scraped: {title}")
-        else:
-            c.execute('''
-                INSERT INTO articles (title, link, published, content, scraped_at, source_id) 
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (title, link, published, content, datetime.utcnow().isoformat(), source_id))
-            article_id = c.lastrowid
-            logging.info(f"Article saved: {title}")
-    except sqlite3.IntegrityError:
-        # Se l'articolo esiste già, aggiorniamo il contenuto se necessario
-        if scraped_now:
-            c.execute('''
-                UPDATE articles 
-                SET content = ?, scraped_at = ?, source_id = ?
-                WHERE link = ?
-            ''', (content, datetime.utcnow().isoformat(), source_id, link))
-            article_id = c.execute('SELECT id FROM articles WHERE link = ?', (link,)).fetchone()[0]
-            logging.info(f"Article updated and re-scraped: {title}")
-        else:
-            # Se l'articolo esiste già e non è un aggiornamento, recuperiamo il suo ID
-            c.execute('SELECT id FROM articles WHERE link = ?', (link,))
-            row = c.fetchone()
-            if row:
-                article_id = row[0]
-                logging.info(f"Article already exists: {title}")
-            else:
-                article_id = None
-
-    conn.commit()
-    conn.close()
+def save_articles(c, scraped_rows, feed_rows):
+    """
+    Salva un blocco di articoli nel database usando il cursore fornito.
+    Entrambe le liste contengono tuple (title, link, published, content, scraped_at, source_id).
+    'scraped_rows' sono gli articoli appena scaricati: se il 'link' (UNIQUE) esiste già,
+    vengono aggiornati 'content', 'scraped_at' e 'source_id'.
+    'feed_rows' sono gli articoli con il solo contenuto del feed: vengono inseriti
+    solo se non ancora presenti.
+    Il commit è a carico del chiamante.
+    """
+    c.executemany('''
+        INSERT INTO articles (title, link, published, content, scraped_at, source_id) 
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(link) DO UPDATE
+        SET content = excluded.content, scraped_at = excluded.scraped_at, source_id = excluded.source_id
+    ''', scraped_rows)
+    c.executemany('''
+        INSERT OR IGNORE INTO articles (title, link, published, content, scraped_at, source_id) 
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', feed_rows)
+    logging.info(f"Articles saved: {len(scraped_rows)} scraped, {len(feed_rows)} from feed summary")
 
 # ----------------------------------------------------------------------------
 # FUNZIONI PER L'ELABORAZIONE TESTO E FEED
 # ----------------------------------------------------------------------------
 
+# Convertitore HTML -> testo, creato una sola volta e riutilizzato per tutti gli articoli
+HTML_CONVERTER = html2text.HTML2Text()
+HTML_CONVERTER.ignore_links = True
+HTML_CONVERTER.ignore_images = True
+
+def html_to_text(raw_content):
+    """
+    Converte in testo semplice il contenuto HTML fornito dal feed.
+    Se non contiene tag basta decodificare le entità (feedparser le lascia
+    nei contenuti text/html), senza passare da html2text.
+    """
+    if '<' not in raw_content:
+        return unescape(raw_content)
+    return HTML_CONVERTER.handle(raw_content)
+
 def fetch_feeds(feed_urls, progress_win=None):
     """
     Scarica i feed RSS dalle URL fornite e restituisce una lista di 'FeedParserDict'.
     Se progress_win è fornito, aggiorna la progress bar e il messaggio corrente.
     """
-    feeds = []
+    feeds = [None] * len(feed_urls)
     total = len(feed_urls)
-    for idx, url in enumerate(feed_urls, start=1):
-        try:
-            feed = feedparser.parse(url)
-            if feed.bozo:
-                raise feed.bozo_exception
-            feeds.append(feed)
-            logging.info(f"Fetched feed: {url}")
-            if progress_win:
-                feed_title = feed.feed.get('title', 'Unknown Source')
-                update_progress_bar(progress_win, idx, total, f"Elaborazione feed: {feed_title}")
-        except Exception as e:
-            logging.error(f"Error fetching feed {url}: {e}")
-            if progress_win:
-                update_progress_bar(progress_win, idx, total, f"Errore nel fetch del feed: {url}")
-    return feeds
+    # I download sono IO-bound: li eseguiamo in parallelo, mentre la progress bar
+    # viene aggiornata solo da questo thread man mano che i feed vengono completati
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        futures = {pool.submit(feedparser.parse, url): pos for pos, url in enumerate(feed_urls)}
+        for idx, future in enumerate(as_completed(futures), start=1):
+            pos = futures[future]
+            url = feed_urls[pos]
+            try:
+                feed = future.result()
+                if feed.bozo:
+                    raise feed.bozo_exception
+                feeds[pos] = feed
+                logging.info(f"Fetched feed: {url}")
+                if progress_win:
+                    feed_title = feed.feed.get('title', 'Unknown Source')
+                    update_progress_bar(progress_win, idx, total, f"Elaborazione feed: {feed_title}")
+            except Exception as e:
+                logging.error(f"Error fetching feed {url}: {e}")
+                if progress_win:
+                    update_progress_bar(progress_win, idx, total, f"Errore nel fetch del feed: {url}")
+    # Mantiene l'ordine del file dei feed, scartando quelli falliti
+    return [feed for feed in feeds if feed is not None]
+
+def create_http_session():
+    """
+    Crea una sessione HTTP condivisa con connessioni persistenti (keep-alive),
+    in modo da riutilizzare TCP e TLS tra articoli dello stesso sito.
+    """
+    session = requests.Session()
+    retry = Retry(total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504))
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=FETCH_WORKERS, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = 'rss_archiver/1.0'
+    return session
+
+# Sessione HTTP usata per lo scraping degli articoli
+HTTP_SESSION = create_http_session()
+
+# Header e tipi di contenuto (in minuscolo) accettati per le pagine degli articoli
+ARTICLE_REQUEST_HEADERS = {'Accept': 'text/html,application/xhtml+xml'}
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+# Selettori CSS per l'estrazione del testo: contenitore principale e paragrafi
+ARTICLE_SELECTOR = 'article'
+PARAGRAPH_SELECTOR = 'p'
 
 def fetch_full_article(link):
     """
@@ -212,33 +297,77 @@ def fetch_full_article(link):
     Restituisce il testo estratto o una stringa vuota in caso di fallimento.
     """
     try:
-        response = requests.get(link, timeout=10)
-        response.raise_for_status()
+        with HTTP_SESSION.get(link, timeout=(5, 10), stream=True, headers=ARTICLE_REQUEST_HEADERS) as response:
+            response.raise_for_status()
+            # Salta subito le risorse che non sono pagine HTML (PDF, immagini, ...)
+            # I media type non distinguono maiuscole e minuscole (es. "Text/HTML; charset=UTF-8")
+            content_type = response.headers.get('Content-Type', '').lower()
+            if content_type and not content_type.startswith(HTML_CONTENT_TYPES):
+                logging.info(f"Skipping non-HTML article content from {link}: {content_type}")
+                return ""
+            # Scarica al massimo MAX_ARTICLE_BYTES, così una pagina enorme non blocca lo scraping
+            html = bytearray()
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                html += chunk
+                if len(html) >= MAX_ARTICLE_BYTES:
+                    del html[MAX_ARTICLE_BYTES:]
+                    break
     except requests.RequestException as e:
         logging.error(f"Error fetching article content from {link}: {e}")
         return ""
     
     try:
-        soup = BeautifulSoup(response.content, 'html.parser')
+        tree = LexborHTMLParser(bytes(html))
         
         # Tenta di estrarre il contenuto principale dell'articolo.
         # Questo metodo è molto generico e potrebbe non funzionare per tutti i siti.
         # Per una migliore estrazione, considera l'uso di librerie come newspaper3k.
-        # Ecco un esempio semplice:
-        article = soup.find('article')
-        if not article:
-            # Fallback: estrai tutto il testo dai tag <p>
-            paragraphs = soup.find_all('p')
-            text = '\n'.join([para.get_text() for para in paragraphs])
-        else:
-            paragraphs = article.find_all('p')
-            text = '\n'.join([para.get_text() for para in paragraphs])
+        # Se non c'è un tag <article>, fallback: estrai tutto il testo dai tag <p>
+        article = tree.css_first(ARTICLE_SELECTOR) or tree
+        text = '\n'.join(para.text() for para in article.css(PARAGRAPH_SELECTOR))
         
         return text
     except Exception as e:
         logging.error(f"Error parsing article content from {link}: {e}")
         return ""
 
+def fetch_feed_title(feed_url):
+    """
+    Ricava il titolo di un feed leggendone solo l'inizio: il titolo del canale
+    si trova quasi sempre nei primi KB, prima dell'elenco degli articoli.
+    Se l'inizio non basta, il feed viene scaricato e analizzato per intero.
+    """
+    with HTTP_SESSION.get(feed_url, timeout=(5, 10), stream=True) as response:
+        response.raise_for_status()
+        content_type = response.headers.get('Content-Type', '')
+        # iter_content (come in fetch_full_article) solleva eccezioni di requests, non di urllib3
+        head = bytearray()
+        for chunk in response.iter_content(chunk_size=8 * 1024):
+            head += chunk
+            if len(head) >= FEED_HEAD_BYTES:
+                del head[FEED_HEAD_BYTES:]
+                break
+        head = bytes(head)
+    # Se il feed è più corto del limite il parsing parziale è già quello completo
+    truncated = len(head) >= FEED_HEAD_BYTES
+    feed = feedparser.parse(head, response_headers={'content-type': content_type})
+    title = feed.feed.get('title')
+    # Il titolo di un documento troncato è accettato solo se feedparser vi ha riconosciuto
+    # un feed RSS/Atom (feed.version); altrimenti serve il controllo sul documento completo
+    if truncated and not (title and feed.version):
+        # Documento troncato senza titolo o non riconosciuto: scarica e analizza il feed completo,
+        # sempre tramite la sessione condivisa (retry, header e timeout)
+        response = HTTP_SESSION.get(feed_url, timeout=(5, 10))
+        response.raise_for_status()
+        feed = feedparser.parse(response.content,
+                                response_headers={'content-type': response.headers.get('Content-Type', '')})
+        title = feed.feed.get('title')
+        truncated = False
+    # Un documento troncato risulta sempre malformato: l'errore conta solo se il feed è completo
+    if feed.bozo and not truncated:
+        raise ValueError(f"Errore nel parsing del feed: {feed.bozo_exception}")
+    return title or 'Unnamed Feed'
+
 def process_feeds(db_name, progress_win=None):
     """
     Legge la lista di feed dal file FEEDS_FILE, li scarica e salva gli articoli nel DB.
@@ -247,71 +376,129 @@ def process_feeds(db_name, progress_win=None):
     """
     feed_urls = read_feeds()
     feeds = fetch_feeds(feed_urls, progress_win)
-    h = html2text.HTML2Text()
-    h.ignore_links = True
-    h.ignore_images = True
-
-    total_feeds = len(feeds)
-    for feed_idx, feed in enumerate(feeds, start=1):
-        source_name = feed.feed.get('title', 'Unknown Source')
-        source_url = feed.feed.get('link', 'Unknown URL')
-        source_id = save_source(db_name, source_name, source_url)
-
-        for entry in feed.entries:
-            title = entry.title
-            link = entry.link
+    # Istante di riferimento unico per il lotto: controllo della cache e 'scraped_at'
+    batch_now = datetime.utcnow()
+    batch_ts = batch_now.isoformat()
+    conn = get_connection(db_name)
+    c = conn.cursor()
+    # Carica una sola volta le fonti già registrate (url -> id)
+    c.execute('SELECT url, id FROM sources')
+    source_map = dict(c.fetchall())
+
+    # Prima passata: per ogni feed verifica quali articoli vanno (ri)scaricati
+    entries = []
+    # Le nuove fonti vengono registrate in una transazione breve, chiusa prima dei download
+    with conn:
+        for feed in feeds:
+            source_name = feed.feed.get('title', 'Unknown Source')
+            source_url = feed.feed.get('link', 'Unknown URL')
+            source_id = source_map.get(source_url)
+            if source_id is None:
+                c.execute('INSERT INTO sources (name, url) VALUES (?, ?)', (source_name, source_url))
+                source_id = c.lastrowid
+                source_map[source_url] = source_id
+                logging.info(f"Source saved: {source_name} ({source_url})")
+
+            # Recupera con un'unica query lo stato degli articoli del feed già presenti nel DB
+            links = [entry.link for entry in feed.entries]
+            c.execute('''
+                SELECT link, content, scraped_at FROM articles
+                WHERE link IN (SELECT value FROM json_each(?))
+            ''', (json.dumps(links),))
+            existing = {link: (content, scraped_at) for link, content, scraped_at in c.fetchall()}
+
+            for entry in feed.entries:
+                link = entry.link
             
-            # Tenta di recuperare la data di pubblicazione
-            if 'published' in entry:
-                published = entry.published
-            elif 'updated' in entry:
-                published = entry.updated
+                # Controlla se l'articolo è già presente nel DB
+                row = existing.get(link)
+
+                needs_scraping = True
+                if row:
+                    content_existing, scraped_at_str = row
+                    if content_existing and len(content_existing) >= 200:
+                        # Verifica se il cache è ancora valida
+                        scraped_at = parse_date_str(scraped_at_str)
+                        if scraped_at:
+                            if batch_now - scraped_at < timedelta(hours=CACHE_DURATION_HOURS):
+                                needs_scraping = False
+                entries.append((entry, source_id, row, needs_scraping))
+
+    # Recupera in parallelo, con un unico pool per tutti i feed, il contenuto
+    # completo degli articoli da aggiornare (ogni link viene scaricato una sola volta)
+    links_to_scrape = list(dict.fromkeys(
+        entry.link for entry, source_id, row, needs_scraping in entries if needs_scraping
+    ))
+    if progress_win and links_to_scrape:
+        update_progress_bar(progress_win, 1, 1, f"Download di {len(links_to_scrape)} articoli...")
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        full_contents = dict(zip(links_to_scrape, pool.map(fetch_full_article, links_to_scrape)))
+
+    scraped_rows = []
+    feed_rows = []
+    for entry, source_id, row, needs_scraping in entries:
+        title = entry.title
+        link = entry.link
+        
+        # Tenta di recuperare la data di pubblicazione, normalizzata in ISO 8601
+        # in modo che SQLite possa ordinarla e confrontarla con datetime()
+        if 'published' in entry:
+            published = to_iso_date(entry.published, entry.get('published_parsed'))
+        elif 'updated' in entry:
+            published = to_iso_date(entry.updated, entry.get('updated_parsed'))
+        else:
+            published = ''
+
+        if needs_scraping:
+            full_content = full_contents.get(link, '')
+            if full_content:
+                content = full_content
+                scraped_now = True
             else:
-                published = ''
-            
-            # Controlla se l'articolo è già presente nel DB
-            conn = sqlite3.connect(db_name)
-            c = conn.cursor()
-            c.execute('SELECT content, scraped_at FROM articles WHERE link = ?', (link,))
-            row = c.fetchone()
-            conn.close()
-
-            needs_scraping = True
-            if row:
-                content_existing, scraped_at_str = row
-                if content_existing and len(content_existing) >= 200:
-                    # Verifica se il cache è ancora valida
-                    if scraped_at_str:
-                        scraped_at = dateutil.parser.parse(scraped_at_str)
-                        if datetime.utcnow() - scraped_at < timedelta(hours=CACHE_DURATION_HOURS):
-                            needs_scraping = False
-            if needs_scraping:
-                # Recupera il contenuto completo dell'articolo
-                full_content = fetch_full_article(link)
-                if full_content:
-                    content = full_content
-                    scraped_now = True
+                # Se non riesce a ottenere il contenuto completo, usa il summary
+                if hasattr(entry, 'content') and len(entry.content) > 0:
+                    raw_content = entry.content[0].value
+                    content = html_to_text(raw_content)
                 else:
-                    # Se non riesce a ottenere il contenuto completo, usa il summary
-                    if hasattr(entry, 'content') and len(entry.content) > 0:
-                        raw_content = entry.content[0].value
-                        content = h.handle(raw_content)
-                    else:
-                        raw_content = entry.get('summary', '')
-                        content = h.handle(raw_content)
-                    scraped_now = False
-            else:
-                # Usa il contenuto esistente
-                content = row[0]
+                    raw_content = entry.get('summary', '')
+                    content = html_to_text(raw_content)
                 scraped_now = False
+        else:
+            # Usa il contenuto esistente
+            content = row[0]
+            scraped_now = False
+
+        # Accodiamo l'inserimento o l'aggiornamento nel DB
+        article_row = (title, link, published, content, batch_ts, source_id)
+        if scraped_now:
+            scraped_rows.append(article_row)
+        elif row is None:
+            feed_rows.append(article_row)
 
-            # Salviamo nel DB (inserimento o aggiornamento)
-            save_article(db_name, title, link, published, content, source_id, scraped_now)
+    # Salviamo tutti gli articoli in un'unica transazione
+    with conn:
+        save_articles(c, scraped_rows, feed_rows)
 
 # ----------------------------------------------------------------------------
 # FUNZIONI PER L'ARCHIVIAZIONE DEGLI ARTICOLI
 # ----------------------------------------------------------------------------
 
+ARCHIVE_FIELDS = ('id', 'title', 'link', 'published', 'content', 'source_id')
+
+def write_archive_file(file_path, rows):
+    """
+    Scrive le righe degli articoli in un file JSON compresso (lista di oggetti),
+    serializzando un articolo alla volta invece di costruire l'intera lista in memoria.
+    Usa il livello di compressione gzip più rapido.
+    """
+    with gzip.open(file_path, 'wt', encoding='utf-8', compresslevel=1) as f:
+        f.write('[')
+        for idx, row in enumerate(rows):
+            if idx:
+                f.write(',\n')
+            f.write(json.dumps(dict(zip(ARCHIVE_FIELDS, row)), ensure_ascii=False))
+        f.write(']\n')
+
 def archive_old_articles(db_name, threshold_days=ARCHIVE_THRESHOLD_DAYS):
     """
     Archivia gli articoli più vecchi di 'threshold_days' giorni.
@@ -319,135 +506,206 @@ def archive_old_articles(db_name, threshold_days=ARCHIVE_THRESHOLD_DAYS):
     organizzati per anno e mese, e poi rimossi dal database principale.
     """
     cutoff_date = datetime.utcnow() - timedelta(days=threshold_days)
-    cutoff_iso = cutoff_date.isoformat()
+    # Stesso formato ISO 8601 delle date salvate, così il confronto tra stringhe è corretto
+    cutoff_iso = cutoff_date.isoformat(timespec='seconds')
 
-    conn = sqlite3.connect(db_name)
+    conn = get_connection(db_name)
     c = conn.cursor()
+    # Anno e mese vengono calcolati da SQLite. Il confronto e l'ordinamento diretti su 'published'
+    # (date ISO, quindi già ordinate per anno e mese) percorrono idx_articles_published senza sort;
+    # le date vuote o non riconosciute vengono escluse perché strftime restituirebbe NULL
     c.execute('''
-        SELECT id, title, link, published, content, source_id FROM articles
-        WHERE published IS NOT NULL AND datetime(published) < ?
+        SELECT id, title, link, published, content, source_id,
+               strftime('%Y', published) AS year, strftime('%m', published) AS month
+        FROM articles
+        WHERE published < ? AND published != '' AND datetime(published) IS NOT NULL
+        ORDER BY published
     ''', (cutoff_iso,))
-    old_articles = c.fetchall()
-    conn.close()
-
-    if not old_articles:
-        logging.info("Nessun articolo da archiviare.")
-        return
-
-    # Organizza gli articoli per anno e mese
-    archive_dict = {}
-    for article in old_articles:
-        id_, title, link, published, content, source_id = article
-        try:
-            pub_datetime = dateutil.parser.parse(published)
-            year = pub_datetime.year
-            month = pub_datetime.month
-            key = f"{year}/{month:02d}"
-            if key not in archive_dict:
-                archive_dict[key] = []
-            archive_dict[key].append({
-                'id': id_,
-                'title': title,
-                'link': link,
-                'published': published,
-                'content': content,
-                'source_id': source_id
-            })
-        except Exception as e:
-            logging.error(f"Errore nel parsing della data per l'articolo ID {id_}: {e}")
 
-    # Salva gli articoli in file JSON compressi
-    for key, articles in archive_dict.items():
-        year, month = key.split('/')
+    # Salva gli articoli in file JSON compressi, organizzati per anno e mese.
+    # Nome del file basato sulla data odierna e su un timestamp, uguale per tutto il lotto
+    now = datetime.utcnow()
+    today = now.strftime("%Y_%m_%d")
+    timestamp = now.strftime("%H%M%S")
+    archived_ids = []
+    for (year, month), group in itertools.groupby(c, key=lambda row: row[6:]):
+        articles = [row[:6] for row in group]
         archive_path = os.path.join(ARCHIVE_DIR, year, month)
         os.makedirs(archive_path, exist_ok=True)
-        # Nome del file basato sulla data odierna e su un timestamp
-        today = datetime.utcnow().strftime("%Y_%m_%d")
-        timestamp = datetime.utcnow().strftime("%H%M%S")
         file_name = f"articles_{today}_{timestamp}.json.gz"
         file_path = os.path.join(archive_path, file_name)
 
         try:
-            with gzip.open(file_path, 'wt', encoding='utf-8') as f:
-                json.dump(articles, f, ensure_ascii=False, indent=2)
+            write_archive_file(file_path, articles)
+            archived_ids.extend(row[0] for row in articles)
             logging.info(f"Archiviati {len(articles)} articoli in {file_path}")
         except Exception as e:
             logging.error(f"Errore nell'archiviazione degli articoli in {file_path}: {e}")
 
-    # Rimuovi gli articoli archiviati dal database principale
-    article_ids = [article[0] for article in old_articles]
-    conn = sqlite3.connect(db_name)
-    c = conn.cursor()
-    c.executemany('DELETE FROM articles WHERE id = ?', [(id_,) for id_ in article_ids])
-    conn.commit()
-    conn.close()
-    logging.info(f"Rimossi {len(article_ids)} articoli dal database principale.")
+    if not archived_ids:
+        logging.info("Nessun articolo da archiviare.")
+        return
+
+    # Rimuovi gli articoli archiviati dal database principale con un'unica istruzione
+    with conn:
+        c.execute('DELETE FROM articles WHERE id IN (SELECT value FROM json_each(?))', (json.dumps(archived_ids),))
+    logging.info(f"Rimossi {len(archived_ids)} articoli dal database principale.")
 
 # ----------------------------------------------------------------------------
 # FUNZIONI PER LA GESTIONE DEI FEED (LETTORE/SCRITTURA FILE)
 # ----------------------------------------------------------------------------
 
+# Cache in memoria della lista dei feed, valida finché il file non viene modificato.
+# 'urls' contiene gli stessi feed di 'feeds' per le verifiche di appartenenza
+FEEDS_CACHE = {'key': None, 'feeds': [], 'urls': set()}
+
+def feeds_file_key(stat_result):
+    """
+    Restituisce la chiave (mtime, dimensione) usata per capire se FEEDS_FILE è cambiato.
+    """
+    return (stat_result.st_mtime_ns, stat_result.st_size)
+
 def add_feed(url):
     """
     Aggiunge un feed al file di testo FEEDS_FILE.
     """
     with open(FEEDS_FILE, 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        key_before = feeds_file_key(os.fstat(f.fileno()))
         f.write(url + '\n')
+        f.flush()
+        # Se la cache rifletteva il file, la aggiorniamo senza doverlo rileggere
+        if FEEDS_CACHE['key'] == key_before:
+            FEEDS_CACHE['feeds'].append(url)
+            FEEDS_CACHE['urls'].add(url)
+            FEEDS_CACHE['key'] = feeds_file_key(os.fstat(f.fileno()))
     logging.info(f"Added new feed: {url}")
 
 def delete_feed_from_file(url):
     """
     Rimuove un feed dal file di testo FEEDS_FILE.
+    Il file viene riscritto solo se il feed era effettivamente presente.
     """
-    if not os.path.exists(FEEDS_FILE):
+    if not refresh_feeds_cache() or url not in FEEDS_CACHE['urls']:
         return
-    with open(FEEDS_FILE, 'r') as f:
+    with open(FEEDS_FILE, 'r+') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
         feeds = [line.strip() for line in f if line.strip() and line.strip() != url]
-    with open(FEEDS_FILE, 'w') as f:
+        f.seek(0)
+        f.truncate()
         for feed in feeds:
             f.write(feed + '\n')
+        f.flush()
+        FEEDS_CACHE['feeds'] = feeds
+        FEEDS_CACHE['urls'] = set(feeds)
+        FEEDS_CACHE['key'] = feeds_file_key(os.fstat(f.fileno()))
     logging.info(f"Deleted feed from file: {url}")
 
-def read_feeds():
+def refresh_feeds_cache():
     """
-    Legge la lista di feed dal file FEEDS_FILE.
+    Aggiorna FEEDS_CACHE rileggendo FEEDS_FILE solo se è cambiato dall'ultima lettura.
     Crea il file se non esiste.
+    Restituisce False se il file non può essere letto.
     """
-    if not os.path.exists(FEEDS_FILE):
+    # Un solo stat per verificare l'esistenza del file e la validità della cache
+    try:
+        stat_result = os.stat(FEEDS_FILE)
+    except FileNotFoundError:
         os.makedirs(os.path.dirname(FEEDS_FILE), exist_ok=True)
         open(FEEDS_FILE, 'w').close()
         logging.info(f"Created empty feeds file at {FEEDS_FILE}")
+        stat_result = os.stat(FEEDS_FILE)
     try:
+        key = feeds_file_key(stat_result)
+        if FEEDS_CACHE['key'] == key:
+            return True
         with open(FEEDS_FILE, 'r') as f:
             feeds = [line.strip() for line in f if line.strip()]
+        FEEDS_CACHE['feeds'] = feeds
+        FEEDS_CACHE['urls'] = set(feeds)
+        FEEDS_CACHE['key'] = key
         logging.info(f"Read {len(feeds)} feeds from {FEEDS_FILE}")
-        return feeds
+        return True
     except Exception as e:
         logging.error(f"Error reading feeds from {FEEDS_FILE}: {e}")
+        return False
+
+def read_feeds():
+    """
+    Legge la lista di feed dal file FEEDS_FILE (tramite la cache in memoria).
+    """
+    if not refresh_feeds_cache():
         return []
+    return list(FEEDS_CACHE['feeds'])
 
 # ----------------------------------------------------------------------------
 # UTILITY PER L'ORDINAMENTO DELLE DATE
 # ----------------------------------------------------------------------------
 
+# Formati di data più comuni nei feed (RFC 822, ISO 8601) e nel campo 'scraped_at'
+DATE_FORMATS = (
+    '%a, %d %b %Y %H:%M:%S %z',
+    '%Y-%m-%dT%H:%M:%S.%f',
+    '%Y-%m-%dT%H:%M:%S%z',
+    '%Y-%m-%dT%H:%M:%S.%f%z',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d %H:%M:%S',
+)
+
+@functools.lru_cache(maxsize=4096)
 def parse_date_str(date_str):
     """
     Tenta di convertire la data (stringa) in un oggetto datetime.
-    Se fallisce, restituisce None.
+    Prova prima i formati noti con strptime e solo in caso di insuccesso
+    ricorre a dateutil. Se fallisce, restituisce None.
     """
+    if not date_str:
+        return None
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, date_format)
+        except ValueError:
+            pass
     try:
         return dateutil.parser.parse(date_str)
     except:
         return None
 
+def to_iso_date(date_str, parsed=None):
+    """
+    Converte la data di un articolo in formato ISO 8601 (UTC, senza fuso orario),
+    interpretabile dalla funzione datetime() di SQLite.
+    'parsed' è l'eventuale struct_time (UTC) già calcolato da feedparser.
+    Se la data non è interpretabile, restituisce la stringa originale.
+    """
+    if parsed:
+        return datetime(*parsed[:6]).isoformat()
+    dt = parse_date_str(date_str)
+    if dt is None:
+        return date_str
+    if dt.tzinfo:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt.isoformat()
+
 # ----------------------------------------------------------------------------
 # FUNZIONI PER L'INTERFACCIA TESTUALE (CURSES)
 # ----------------------------------------------------------------------------
 
-def ui_main(stdscr, db_name):
+# Attributi delle coppie di colori, calcolati una sola volta da init_colors()
+# (curses.color_pair richiede che curses sia già stato avviato)
+CP_NORMAL = 0       # Ciano: righe delle liste
+CP_OK = 0           # Verde: conferme e voci selezionate
+CP_PROMPT = 0       # Giallo: richieste e istruzioni
+CP_HIGHLIGHT = 0    # Magenta: voci in evidenza nel menu
+CP_ERR = 0          # Rosso: errori
+CP_TITLE_BOLD = 0   # Bianco su blu, grassetto: titoli delle schermate
+
+def init_colors():
     """
-    Menu principale dell'applicazione.
+    Definisce le coppie di colori dell'interfaccia e ne memorizza gli attributi
+    nelle costanti CP_*, evitando di chiamare curses.color_pair a ogni disegno.
     """
+    global CP_NORMAL, CP_OK, CP_PROMPT, CP_HIGHLIGHT, CP_ERR, CP_TITLE_BOLD
     curses.start_color()
     curses.init_pair(1, curses.COLOR_CYAN, curses.COLOR_BLACK)
     curses.init_pair(2, curses.COLOR_GREEN, curses.COLOR_BLACK)
@@ -455,15 +713,27 @@ def ui_main(stdscr, db_name):
     curses.init_pair(4, curses.COLOR_MAGENTA, curses.COLOR_BLACK)
     curses.init_pair(5, curses.COLOR_RED, curses.COLOR_BLACK)
     curses.init_pair(6, curses.COLOR_WHITE, curses.COLOR_BLUE)
+    CP_NORMAL = curses.color_pair(1)
+    CP_OK = curses.color_pair(2)
+    CP_PROMPT = curses.color_pair(3)
+    CP_HIGHLIGHT = curses.color_pair(4)
+    CP_ERR = curses.color_pair(5)
+    CP_TITLE_BOLD = curses.color_pair(6) | curses.A_BOLD
+
+def ui_main(stdscr, db_name):
+    """
+    Menu principale dell'applicazione.
+    """
+    init_colors()
 
     while True:
         stdscr.clear()
         # Aggiungi un bordo
         height, width = stdscr.getmaxyx()
         border_text = " RSS Archiver "
-        stdscr.attron(curses.color_pair(6) | curses.A_BOLD)
+        stdscr.attron(CP_TITLE_BOLD)
         stdscr.addstr(0, max((width - len(border_text)) // 2, 0), border_text)
-        stdscr.attroff(curses.color_pair(6) | curses.A_BOLD)
+        stdscr.attroff(CP_TITLE_BOLD)
         stdscr.border()
 
         # Menu Opzioni
@@ -479,13 +749,13 @@ def ui_main(stdscr, db_name):
         start_y = 3
         for idx, option in enumerate(menu_options, start=start_y):
             if option.startswith("5. Gestisci"):
-                safe_addstr(stdscr, idx, 2, option, curses.color_pair(4))
+                safe_addstr(stdscr, idx, 2, option, CP_HIGHLIGHT, (height, width))
             else:
-                safe_addstr(stdscr, idx, 2, option, curses.color_pair(2) if idx == start_y else 0)
+                safe_addstr(stdscr, idx, 2, option, CP_OK if idx == start_y else 0, (height, width))
 
         # Istruzioni
         instruction = "Seleziona un'opzione premendo il numero corrispondente."
-        safe_addstr(stdscr, start_y + len(menu_options) + 2, 2, instruction, curses.color_pair(3))
+        safe_addstr(stdscr, start_y + len(menu_options) + 2, 2, instruction, CP_PROMPT)
         stdscr.refresh()
 
         key = stdscr.getch()
@@ -506,20 +776,19 @@ def ui_main(stdscr, db_name):
             break
         else:
             # Mostra un messaggio di errore temporaneo
-            show_message(stdscr, "Opzione non valida! Premi un tasto per continuare.", curses.color_pair(5))
+            show_message(stdscr, "Opzione non valida! Premi un tasto per continuare.", CP_ERR)
 
 def select_source(stdscr, db_name):
     """
     Mostra un elenco delle fonti e permette di selezionare una fonte per visualizzare i suoi articoli.
     """
-    conn = sqlite3.connect(db_name)
+    conn = get_connection(db_name)
     c = conn.cursor()
     c.execute('SELECT id, name FROM sources ORDER BY name ASC')
     sources = c.fetchall()
-    conn.close()
 
     if not sources:
-        show_message(stdscr, "Nessuna fonte RSS aggiunta. Aggiungi una fonte prima di procedere.", curses.color_pair(5))
+        show_message(stdscr, "Nessuna fonte RSS aggiunta. Aggiungi una fonte prima di procedere.", CP_ERR)
         return
 
     page = 0
@@ -532,9 +801,9 @@ def select_source(stdscr, db_name):
         stdscr.border()
         # Titolo
         title_text = f" Seleziona una Fonte (Pagina {page + 1}/{total_pages}) "
-        stdscr.attron(curses.color_pair(6) | curses.A_BOLD)
+        stdscr.attron(CP_TITLE_BOLD)
         stdscr.addstr(0, max((width - len(title_text)) // 2, 0), title_text)
-        stdscr.attroff(curses.color_pair(6) | curses.A_BOLD)
+        stdscr.attroff(CP_TITLE_BOLD)
 
         start = page * sources_per_page
         end = start + sources_per_page
@@ -544,12 +813,12 @@ def select_source(stdscr, db_name):
         for idx, (source_id, source_name) in enumerate(current_sources, start=1):
             line_num = idx
             line_text = f"{idx}. {source_name}"
-            safe_addstr(stdscr, y_offset, 2, line_text, curses.color_pair(2) | curses.A_UNDERLINE)
+            safe_addstr(stdscr, y_offset, 2, line_text, CP_OK | curses.A_UNDERLINE, (height, width))
             y_offset += 1
 
         # Istruzioni per la navigazione
         navigation = "Premi un numero per selezionare la fonte, 'n' per pagina successiva, 'p' per precedente, 'q' per tornare indietro."
-        safe_addstr(stdscr, height - 2, 2, navigation, curses.color_pair(3))
+        safe_addstr(stdscr, height - 2, 2, navigation, CP_PROMPT)
         stdscr.refresh()
 
         key = stdscr.getch()
@@ -566,14 +835,14 @@ def select_source(stdscr, db_name):
                 display_articles_by_source(stdscr, db_name, selected_source_id, selected_source_name)
         else:
             # Mostra un messaggio di errore temporaneo
-            show_message(stdscr, "Input non valido! Premi un tasto per continuare.", curses.color_pair(5))
+            show_message(stdscr, "Input non valido! Premi un tasto per continuare.", CP_ERR)
 
 def display_articles_by_source(stdscr, db_name, source_id, source_name):
     """
     Mostra gli articoli di una specifica fonte in modo paginato.
     Limita la visualizzazione a 9 articoli per pagina per facilitare la selezione.
     """
-    conn = sqlite3.connect(db_name)
+    conn = get_connection(db_name)
     c = conn.cursor()
     c.execute('''
         SELECT id, title, published FROM articles 
@@ -584,16 +853,8 @@ def display_articles_by_source(stdscr, db_name, source_id, source_name):
                 ELSE datetime('1970-01-01')
             END DESC
     ''', (source_id,))
-    rows = c.fetchall()
-    conn.close()
-
-    articles = []
-    for art_id, title, published_str in rows:
-        dt = parse_date_str(published_str)  # None se parsing fallisce
-        articles.append((art_id, title, published_str, dt))
-
-    # Ordiniamo decrescentemente in base a dt (chi non ha data, va in fondo)
-    articles.sort(key=lambda x: x[3] if x[3] else datetime.min, reverse=True)
+    # Le date sono salvate in ISO 8601, quindi l'ordinamento di SQLite è già quello definitivo
+    articles = c.fetchall()
 
     page = 0
     articles_per_page = 9  # Limitazione a 9 articoli per pagina
@@ -605,24 +866,24 @@ def display_articles_by_source(stdscr, db_name, source_id, source_name):
         stdscr.border()
         # Titolo
         title_text = f" Articoli di '{source_name}' (Pagina {page + 1}/{total_pages}) "
-        stdscr.attron(curses.color_pair(6) | curses.A_BOLD)
+        stdscr.attron(CP_TITLE_BOLD)
         stdscr.addstr(0, max((width - len(title_text)) // 2, 0), title_text)
-        stdscr.attroff(curses.color_pair(6) | curses.A_BOLD)
+        stdscr.attroff(CP_TITLE_BOLD)
 
         start = page * articles_per_page
         end = start + articles_per_page
         current_articles = articles[start:end]
 
         y_offset = 2
-        for idx, (art_id, title, published_str, dt) in enumerate(current_articles, start=1):
+        for idx, (art_id, title, published_str) in enumerate(current_articles, start=1):
             line_num = idx
             line_text = f"{idx}. {title} ({published_str})"
-            safe_addstr(stdscr, y_offset, 2, line_text, curses.color_pair(1))
+            safe_addstr(stdscr, y_offset, 2, line_text, CP_NORMAL, (height, width))
             y_offset += 1
 
         # Istruzioni per la navigazione
         navigation = "Premi un numero (1-9) per leggere l'articolo, 'n' per pagina successiva, 'p' per precedente, 'q' per tornare indietro."
-        safe_addstr(stdscr, height - 2, 2, navigation, curses.color_pair(3))
+        safe_addstr(stdscr, height - 2, 2, navigation, CP_PROMPT)
         stdscr.refresh()
 
         key = stdscr.getch()
@@ -639,13 +900,13 @@ def display_articles_by_source(stdscr, db_name, source_id, source_name):
                 show_article(stdscr, db_name, article_id)
         else:
             # Mostra un messaggio di errore temporaneo
-            show_message(stdscr, "Input non valido! Premi un tasto per continuare.", curses.color_pair(5))
+            show_message(stdscr, "Input non valido! Premi un tasto per continuare.", CP_ERR)
 
 def show_article(stdscr, db_name, article_id):
     """
     Mostra un menù di azioni (visualizza, salva, stampa, modifica tag, torna indietro) per l’articolo selezionato.
     """
-    conn = sqlite3.connect(db_name)
+    conn = get_connection(db_name)
     c = conn.cursor()
     c.execute('SELECT title, content, published FROM articles WHERE id = ?', (article_id,))
     article = c.fetchone()
@@ -657,18 +918,17 @@ def show_article(stdscr, db_name, article_id):
             WHERE article_tags.article_id = ?
         ''', (article_id,))
         tags = [row[0] for row in c.fetchall()]
-    conn.close()
 
     stdscr.clear()
     height, width = stdscr.getmaxyx()
     stdscr.border()
     # Titolo
-    safe_addstr(stdscr, 0, 2, title, curses.A_BOLD | curses.color_pair(2))
+    safe_addstr(stdscr, 0, 2, title, curses.A_BOLD | CP_OK)
     # Pubblicazione
-    safe_addstr(stdscr, 1, 2, f"Pubblicato: {pubdate}", curses.color_pair(3))
+    safe_addstr(stdscr, 1, 2, f"Pubblicato: {pubdate}", CP_PROMPT)
     # Tags
     tags_line = "Tags: " + ", ".join(tags) if tags else "Tags: nessuno"
-    safe_addstr(stdscr, 2, 2, tags_line, curses.color_pair(3))
+    safe_addstr(stdscr, 2, 2, tags_line, CP_PROMPT)
     # Opzioni
     action_options = [
         "1. Visualizza a Schermo",
@@ -679,11 +939,11 @@ def show_article(stdscr, db_name, article_id):
     ]
     start_y = 4
     for idx, option in enumerate(action_options, start=start_y):
-        safe_addstr(stdscr, idx, 4, option, curses.color_pair(2))
+        safe_addstr(stdscr, idx, 4, option, CP_OK, (height, width))
 
     # Istruzioni
     instruction = "Seleziona un'opzione premendo il numero corrispondente."
-    safe_addstr(stdscr, start_y + len(action_options) + 1, 4, instruction, curses.color_pair(3))
+    safe_addstr(stdscr, start_y + len(action_options) + 1, 4, instruction, CP_PROMPT)
     stdscr.refresh()
 
     while True:
@@ -703,7 +963,7 @@ def show_article(stdscr, db_name, article_id):
         elif key == ord('5'):
             break
         else:
-            show_message(stdscr, "Opzione non valida! Premi un tasto per continuare.", curses.color_pair(5))
+            show_message(stdscr, "Opzione non valida! Premi un tasto per continuare.", CP_ERR)
 
 def display_full_article(stdscr, title, content):
     """
@@ -720,18 +980,18 @@ def display_full_article(stdscr, title, content):
         height, width = stdscr.getmaxyx()
         stdscr.border()
         # Titolo
-        safe_addstr(stdscr, 0, 2, title, curses.A_BOLD | curses.color_pair(2))
+        safe_addstr(stdscr, 0, 2, title, curses.A_BOLD | CP_OK)
         # Contenuto
         start = page * lines_per_page
         end = start + lines_per_page
         chunk = lines[start:end]
 
         for idx, line in enumerate(chunk, start=2):
-            safe_addstr(stdscr, idx, 2, line)
+            safe_addstr(stdscr, idx, 2, line, 0, (height, width))
 
         # Footer
         footer = f"Pagina {page + 1}/{total_pages} | [n] Avanti, [p] Indietro, [q] Esci"
-        safe_addstr(stdscr, lines_per_page + 3, 2, footer, curses.color_pair(3))
+        safe_addstr(stdscr, lines_per_page + 3, 2, footer, CP_PROMPT)
         stdscr.refresh()
 
         key = stdscr.getch()
@@ -742,7 +1002,7 @@ def display_full_article(stdscr, title, content):
         elif key == ord('p') and page > 0:
             page -= 1
         else:
-            show_message(stdscr, "Input non valido! Premi un tasto per continuare.", curses.color_pair(5))
+            show_message(stdscr, "Input non valido! Premi un tasto per continuare.", CP_ERR)
 
 def save_article_to_file(stdscr, title, content):
     """
@@ -753,7 +1013,7 @@ def save_article_to_file(stdscr, title, content):
     height, width = stdscr.getmaxyx()
     stdscr.border()
     prompt = "Inserisci il percorso del file (es. /home/pi/articolo.txt): "
-    safe_addstr(stdscr, 2, 2, prompt, curses.color_pair(3))
+    safe_addstr(stdscr, 2, 2, prompt, CP_PROMPT)
     stdscr.refresh()
     filepath_bytes = stdscr.getstr(3, 2, width - 4)
     curses.noecho()
@@ -765,16 +1025,16 @@ def save_article_to_file(stdscr, title, content):
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(f"Title: {title}\n\n{content}")
         success_msg = "Articolo salvato con successo!"
-        safe_addstr(stdscr, 5, 2, success_msg, curses.color_pair(2))
+        safe_addstr(stdscr, 5, 2, success_msg, CP_OK)
         logging.info(f"Article saved to file: {filepath}")
     except Exception as e:
         err_msg = f"Errore nel salvataggio: {e}"
-        safe_addstr(stdscr, 5, 2, err_msg, curses.color_pair(5))
+        safe_addstr(stdscr, 5, 2, err_msg, CP_ERR)
         logging.error(f"Error saving article to file: {e}")
 
     # Istruzioni finali
     final_msg = "Premi un tasto per continuare."
-    safe_addstr(stdscr, 7, 2, final_msg, curses.color_pair(3))
+    safe_addstr(stdscr, 7, 2, final_msg, CP_PROMPT)
     stdscr.refresh()
     stdscr.getch()
 
@@ -783,25 +1043,32 @@ def print_article(stdscr, title, content):
     Invia l'articolo alla stampante di rete 'Canon' configurata in CUPS.
     """
     full_content = f"Title: {title}\n\n{content}"
-    temp_print_file = "/tmp/temp_article.txt"
     try:
-        with open(temp_print_file, 'w', encoding='utf-8') as f:
-            f.write(full_content)
-        
-        # Comando per stampare usando CUPS
-        subprocess.run(['lp', '-d', PRINTER_NAME, temp_print_file], check=True)
-        logging.info(f"Article sent to printer {PRINTER_NAME}")
-        show_message(stdscr, "Articolo inviato alla stampante con successo!", curses.color_pair(2))
+        # Comando per stampare usando CUPS: il testo viene passato a 'lp' sullo standard input.
+        # Anche stdout e stderr passano da pipe, così i messaggi di 'lp' non sporcano lo schermo curses
+        proc = subprocess.Popen(['lp', '-d', PRINTER_NAME],
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        out, err = proc.communicate(full_content.encode('utf-8'))
+        if proc.returncode:
+            raise subprocess.CalledProcessError(proc.returncode, proc.args, out, err)
+        # 'lp' risponde con l'identificativo del lavoro di stampa (es. "request id is Canon-42 (1 file(s))")
+        logging.info(f"Article sent to printer {PRINTER_NAME}: {out.decode('utf-8', 'replace').strip()}")
+        show_message(stdscr, "Articolo inviato alla stampante con successo!", CP_OK)
     except subprocess.CalledProcessError as e:
-        logging.error(f"Error printing article: {e}")
-        show_message(stdscr, f"Errore nella stampa: {e}", curses.color_pair(5))
+        logging.error(f"Error printing article: {e} {e.stderr.decode('utf-8', 'replace').strip()}")
+        show_message(stdscr, f"Errore nella stampa: {e}", CP_ERR)
     except Exception as e:
-        logging.error(f"Error writing to temp file for printing: {e}")
-        show_message(stdscr, f"Errore nella stampa: {e}", curses.color_pair(5))
-    finally:
-        # Rimuovi il file temporaneo se esiste
-        if os.path.exists(temp_print_file):
-            os.remove(temp_print_file)
+        logging.error(f"Error sending article to printer: {e}")
+        show_message(stdscr, f"Errore nella stampa: {e}", CP_ERR)
+
+# Separatore delle tag inserite dall'utente: virgola con eventuali spazi attorno
+TAG_SPLIT = re.compile(r'\s*,\s*')
+
+def split_tags(text):
+    """
+    Divide una stringa di tag separati da virgola, scartando quelli vuoti.
+    """
+    return [tag for tag in TAG_SPLIT.split(text.strip()) if tag]
 
 def edit_tags_ui(stdscr, db_name, article_id, current_tags):
     """
@@ -813,13 +1080,13 @@ def edit_tags_ui(stdscr, db_name, article_id, current_tags):
     height, width = stdscr.getmaxyx()
     stdscr.border()
     prompt_remove = "Tag attuali (separati da virgola). Inserisci quelli da rimuovere (lascia vuoto per nessuna rimozione): "
-    safe_addstr(stdscr, 2, 2, prompt_remove, curses.color_pair(3))
-    safe_addstr(stdscr, 3, 2, f"{', '.join(current_tags)}", curses.color_pair(1))
+    safe_addstr(stdscr, 2, 2, prompt_remove, CP_PROMPT)
+    safe_addstr(stdscr, 3, 2, f"{', '.join(current_tags)}", CP_NORMAL)
     stdscr.refresh()
     remove_input_bytes = stdscr.getstr(4, 2, width - 4)
     curses.noecho()
 
-    tags_to_remove = [tag.strip() for tag in remove_input_bytes.decode('utf-8').split(',') if tag.strip()]
+    tags_to_remove = split_tags(remove_input_bytes.decode('utf-8'))
     if tags_to_remove:
         remove_tags(db_name, article_id, tags_to_remove)
 
@@ -827,77 +1094,90 @@ def edit_tags_ui(stdscr, db_name, article_id, current_tags):
     stdscr.clear()
     stdscr.border()
     prompt_add = "Inserisci le nuove tag da aggiungere (separati da virgola): "
-    safe_addstr(stdscr, 2, 2, prompt_add, curses.color_pair(3))
+    safe_addstr(stdscr, 2, 2, prompt_add, CP_PROMPT)
     stdscr.refresh()
     add_input_bytes = stdscr.getstr(3, 2, width - 4)
     curses.noecho()
 
-    tags_to_add = [tag.strip() for tag in add_input_bytes.decode('utf-8').split(',') if tag.strip()]
+    tags_to_add = split_tags(add_input_bytes.decode('utf-8'))
     if tags_to_add:
         add_tags(db_name, article_id, tags_to_add)
 
     # Messaggio di conferma
     success_msg = "Tag aggiornate con successo!"
-    safe_addstr(stdscr, 5, 2, success_msg, curses.color_pair(2))
+    safe_addstr(stdscr, 5, 2, success_msg, CP_OK)
     logging.info(f"Tags updated for article ID {article_id}: Added {tags_to_add}, Removed {tags_to_remove}")
     
     # Istruzioni finali
     final_msg = "Premi un tasto per continuare."
-    safe_addstr(stdscr, 7, 2, final_msg, curses.color_pair(3))
+    safe_addstr(stdscr, 7, 2, final_msg, CP_PROMPT)
     stdscr.refresh()
     stdscr.getch()
 
+# RETURNING è disponibile da SQLite 3.35: permette di ottenere l'id della tag direttamente dall'upsert
+SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35)
+
 def add_tags(db_name, article_id, tags_to_add):
     """
     Aggiunge nuove tag a un articolo.
-    """
-    conn = sqlite3.connect(db_name)
-    c = conn.cursor()
-    for tag in tags_to_add:
-        c.execute('INSERT OR IGNORE INTO tags (tag) VALUES (?)', (tag,))
-        # Recupera l'id del tag appena inserito o esistente
-        c.execute('SELECT id FROM tags WHERE tag = ?', (tag,))
-        tag_row = c.fetchone()
-        if tag_row:
-            tag_id = tag_row[0]
-            try:
-                c.execute('INSERT INTO article_tags (article_id, tag_id) VALUES (?, ?)', (article_id, tag_id))
-            except sqlite3.IntegrityError:
-                pass  # Relazione già esistente
-    conn.commit()
-    conn.close()
+    Inserisce le tag mancanti recuperandone gli id (con un'unica istruzione per tag
+    se SQLite supporta RETURNING) e crea le relazioni con l'articolo, il tutto in
+    un'unica transazione.
+    """
+    with db_transaction(db_name) as conn:
+        c = conn.cursor()
+        if SQLITE_HAS_RETURNING:
+            # L'upsert restituisce l'id sia delle tag nuove sia di quelle esistenti
+            tag_ids = [
+                c.execute('''
+                    INSERT INTO tags (tag) VALUES (?)
+                    ON CONFLICT(tag) DO UPDATE SET tag = excluded.tag
+                    RETURNING id
+                ''', (tag,)).fetchone()[0]
+                for tag in tags_to_add
+            ]
+        else:
+            c.executemany('INSERT OR IGNORE INTO tags (tag) VALUES (?)', [(tag,) for tag in tags_to_add])
+            # Recupera gli id delle tag appena inserite o esistenti
+            placeholders = ','.join(['?'] * len(tags_to_add))
+            c.execute(f'SELECT id FROM tags WHERE tag IN ({placeholders})', tags_to_add)
+            tag_ids = [row[0] for row in c.fetchall()]
+        # Le relazioni già esistenti vengono ignorate
+        c.executemany('INSERT OR IGNORE INTO article_tags (article_id, tag_id) VALUES (?, ?)',
+                      [(article_id, tag_id) for tag_id in tag_ids])
 
 def remove_tags(db_name, article_id, tags_to_remove):
     """
-    Rimuove tag da un articolo.
+    Rimuove tag da un articolo con un'unica istruzione DELETE.
     """
-    conn = sqlite3.connect(db_name)
-    c = conn.cursor()
-    for tag in tags_to_remove:
-        # Recupera l'id del tag
-        c.execute('SELECT id FROM tags WHERE tag = ?', (tag,))
-        tag_row = c.fetchone()
-        if tag_row:
-            tag_id = tag_row[0]
-            # Rimuove la relazione
-            c.execute('DELETE FROM article_tags WHERE article_id = ? AND tag_id = ?', (article_id, tag_id))
-    conn.commit()
-    conn.close()
+    placeholders = ','.join(['?'] * len(tags_to_remove))
+    with db_transaction(db_name) as conn:
+        conn.execute(f'''
+            DELETE FROM article_tags
+            WHERE article_id = ? AND tag_id IN (SELECT id FROM tags WHERE tag IN ({placeholders}))
+        ''', (article_id, *tags_to_remove))
 
 def manage_feeds_ui(stdscr, db_name):
     """
     Interfaccia per gestire le sorgenti RSS.
     Permette di elencare, eliminare e rinominare le sorgenti RSS.
+    L'elenco delle sorgenti viene letto una sola volta e condiviso tra le schermate,
+    che lo aggiornano direttamente dopo un'eliminazione o una rinomina.
     """
+    conn = get_connection(db_name)
+    c = conn.cursor()
+    c.execute('SELECT id, name, url FROM sources ORDER BY name ASC')
+    feeds = c.fetchall()
+
     while True:
         stdscr.clear()
         height, width = stdscr.getmaxyx()
         stdscr.border()
         # Titolo
         title_text = " Gestisci Feed RSS "
-        stdscr.attron(curses.color_pair(6) | curses.A_BOLD)
+        stdscr.attron(CP_TITLE_BOLD)
         stdscr.addstr(0, max((width - len(title_text)) // 2, 0), title_text)
-        stdscr.attroff(curses.color_pair(6) | curses.A_BOLD)
+        stdscr.attroff(CP_TITLE_BOLD)
 
         # Opzioni di gestione
         options = [
@@ -908,68 +1188,60 @@ def manage_feeds_ui(stdscr, db_name):
         ]
         start_y = 2
         for idx, option in enumerate(options, start=start_y):
-            safe_addstr(stdscr, idx, 2, option, curses.color_pair(2) if idx == start_y else 0)
+            safe_addstr(stdscr, idx, 2, option, CP_OK if idx == start_y else 0)
 
         # Istruzioni
         instruction = "Seleziona un'opzione premendo il numero corrispondente."
-        safe_addstr(stdscr, start_y + len(options) + 2, 2, instruction, curses.color_pair(3))
+        safe_addstr(stdscr, start_y + len(options) + 2, 2, instruction, CP_PROMPT)
         stdscr.refresh()
 
         key = stdscr.getch()
 
         if key == ord('1'):
-            list_feeds_ui(stdscr, db_name)
+            list_feeds_ui(stdscr, db_name, feeds)
         elif key == ord('2'):
-            delete_feed_ui(stdscr, db_name)
+            delete_feed_ui(stdscr, db_name, feeds)
         elif key == ord('3'):
-            rename_feed_ui(stdscr, db_name)
+            rename_feed_ui(stdscr, db_name, feeds)
         elif key == ord('4'):
             break
         else:
-            show_message(stdscr, "Opzione non valida! Premi un tasto per continuare.", curses.color_pair(5))
+            show_message(stdscr, "Opzione non valida! Premi un tasto per continuare.", CP_ERR)
 
-def list_feeds_ui(stdscr, db_name):
+def list_feeds_ui(stdscr, db_name, feeds):
     """
     Elenca tutte le sorgenti RSS con nome e URL.
     """
-    conn = sqlite3.connect(db_name)
-    c = conn.cursor()
-    c.execute('SELECT id, name, url FROM sources ORDER BY name ASC')
-    feeds = c.fetchall()
-    conn.close()
-
     if not feeds:
-        show_message(stdscr, "Nessun feed RSS presente.", curses.color_pair(5))
+        show_message(stdscr, "Nessun feed RSS presente.", CP_ERR)
         return
 
     page = 0
     feeds_per_page = 10  # Numero di feed per pagina
     total_pages = (len(feeds) + feeds_per_page - 1) // feeds_per_page
 
-    while True:
-        stdscr.clear()
-        height, width = stdscr.getmaxyx()
-        stdscr.border()
-        # Titolo
-        title_text = f" Elenco dei Feed RSS (Pagina {page + 1}/{total_pages}) "
-        stdscr.attron(curses.color_pair(6) | curses.A_BOLD)
-        stdscr.addstr(0, max((width - len(title_text)) // 2, 0), title_text)
-        stdscr.attroff(curses.color_pair(6) | curses.A_BOLD)
-
-        start = page * feeds_per_page
-        end = start + feeds_per_page
-        current_feeds = feeds[start:end]
-
-        y_offset = 2
-        for idx, (feed_id, name, url) in enumerate(current_feeds, start=1):
-            line_text = f"{start + idx}. Nome: {name} | URL: {url}"
-            safe_addstr(stdscr, y_offset, 2, line_text, curses.color_pair(1))
-            y_offset += 1
+    # Le righe vengono formattate una sola volta nel pad
+    height, width = stdscr.getmaxyx()
+    lines = [f"{idx}. Nome: {name} | URL: {url}" for idx, (feed_id, name, url) in enumerate(feeds, start=1)]
+    pad = build_list_pad(lines, feeds_per_page, width, CP_NORMAL)
 
-        # Istruzioni per la navigazione
-        navigation = "Premi 'n' per pagina successiva, 'p' per precedente, 'q' per tornare indietro."
-        safe_addstr(stdscr, height - 2, 2, navigation, curses.color_pair(3))
-        stdscr.refresh()
+    redraw = True
+    while True:
+        if redraw:
+            stdscr.erase()
+            height, width = stdscr.getmaxyx()
+            stdscr.border()
+            # Titolo
+            title_text = f" Elenco dei Feed RSS (Pagina {page + 1}/{total_pages}) "
+            stdscr.attron(CP_TITLE_BOLD)
+            stdscr.addstr(0, max((width - len(title_text)) // 2, 0), title_text)
+            stdscr.attroff(CP_TITLE_BOLD)
+
+            # Istruzioni per la navigazione
+            navigation = "Premi 'n' per pagina successiva, 'p' per precedente, 'q' per tornare indietro."
+            safe_addstr(stdscr, height - 2, 2, navigation, CP_PROMPT)
+            refresh_list_page(stdscr, pad, page, feeds_per_page)
+        redraw = True
 
         key = stdscr.getch()
         if key == ord('q'):
@@ -979,50 +1251,51 @@ def list_feeds_ui(stdscr, db_name):
         elif key == ord('p') and page > 0:
             page -= 1
         else:
-            show_message(stdscr, "Input non valido! Premi un tasto per continuare.", curses.color_pair(5))
+            # Nessun ridisegno: mostra solo l'errore sopra le istruzioni
+            safe_addstr(stdscr, height - 3, 2, "Input non valido!", CP_ERR)
+            stdscr.refresh()
+            redraw = False
 
-def delete_feed_ui(stdscr, db_name):
+def delete_feed_ui(stdscr, db_name, feeds):
     """
     Interfaccia per eliminare un feed RSS.
     """
-    conn = sqlite3.connect(db_name)
-    c = conn.cursor()
-    c.execute('SELECT id, name, url FROM sources ORDER BY name ASC')
-    feeds = c.fetchall()
-    conn.close()
-
     if not feeds:
-        show_message(stdscr, "Nessun feed RSS presente da eliminare.", curses.color_pair(5))
+        show_message(stdscr, "Nessun feed RSS presente da eliminare.", CP_ERR)
         return
 
     page = 0
     feeds_per_page = 10  # Numero di feed per pagina
     total_pages = (len(feeds) + feeds_per_page - 1) // feeds_per_page
 
+    pad = None
+    redraw = True
     while True:
-        stdscr.clear()
-        height, width = stdscr.getmaxyx()
-        stdscr.border()
-        # Titolo
-        title_text = f" Elimina un Feed RSS (Pagina {page + 1}/{total_pages}) "
-        stdscr.attron(curses.color_pair(6) | curses.A_BOLD)
-        stdscr.addstr(0, max((width - len(title_text)) // 2, 0), title_text)
-        stdscr.attroff(curses.color_pair(6) | curses.A_BOLD)
-
         start = page * feeds_per_page
         end = start + feeds_per_page
         current_feeds = feeds[start:end]
 
-        y_offset = 2
-        for idx, (feed_id, name, url) in enumerate(current_feeds, start=1):
-            line_text = f"{start + idx}. Nome: {name} | URL: {url}"
-            safe_addstr(stdscr, y_offset, 2, line_text, curses.color_pair(1))
-            y_offset += 1
-
-        # Istruzioni per la navigazione
-        navigation = "Premi il numero del feed da eliminare, 'n' per pagina successiva, 'p' per precedente, 'q' per tornare indietro."
-        safe_addstr(stdscr, height - 2, 2, navigation, curses.color_pair(3))
-        stdscr.refresh()
+        if pad is None:
+            # Le righe vengono formattate nel pad solo quando la lista cambia
+            height, width = stdscr.getmaxyx()
+            lines = [f"{idx}. Nome: {name} | URL: {url}" for idx, (feed_id, name, url) in enumerate(feeds, start=1)]
+            pad = build_list_pad(lines, feeds_per_page, width, CP_NORMAL)
+
+        if redraw:
+            stdscr.erase()
+            height, width = stdscr.getmaxyx()
+            stdscr.border()
+            # Titolo
+            title_text = f" Elimina un Feed RSS (Pagina {page + 1}/{total_pages}) "
+            stdscr.attron(CP_TITLE_BOLD)
+            stdscr.addstr(0, max((width - len(title_text)) // 2, 0), title_text)
+            stdscr.attroff(CP_TITLE_BOLD)
+
+            # Istruzioni per la navigazione
+            navigation = "Premi il numero del feed da eliminare, 'n' per pagina successiva, 'p' per precedente, 'q' per tornare indietro."
+            safe_addstr(stdscr, height - 2, 2, navigation, CP_PROMPT)
+            refresh_list_page(stdscr, pad, page, feeds_per_page)
+        redraw = True
 
         key = stdscr.getch()
         if key == ord('q'):
@@ -1038,64 +1311,64 @@ def delete_feed_ui(stdscr, db_name):
                 # Conferma eliminazione
                 confirm = confirm_action(stdscr, f"Sei sicuro di voler eliminare il feed '{selected_name}'?")
                 if confirm:
-                    delete_source(db_name, selected_feed_id)
+                    with db_transaction(db_name) as conn:
+                        delete_source(conn, selected_feed_id)
                     delete_feed_from_file(selected_url)
-                    show_message(stdscr, f"Feed '{selected_name}' eliminato con successo.", curses.color_pair(2))
-                    # Ricarica la lista dei feed dopo l'eliminazione
-                    conn = sqlite3.connect(db_name)
-                    c = conn.cursor()
-                    c.execute('SELECT id, name, url FROM sources ORDER BY name ASC')
-                    feeds = c.fetchall()
-                    conn.close()
+                    show_message(stdscr, f"Feed '{selected_name}' eliminato con successo.", CP_OK)
+                    # Aggiorna la lista condivisa senza rileggerla dal database
+                    feeds.pop(start + selection)
                     if not feeds:
-                        show_message(stdscr, "Tutti i feed sono stati eliminati.", curses.color_pair(2))
+                        show_message(stdscr, "Tutti i feed sono stati eliminati.", CP_OK)
                         break
                     total_pages = (len(feeds) + feeds_per_page - 1) // feeds_per_page
+                    page = min(page, total_pages - 1)
+                    pad = None
         else:
-            show_message(stdscr, "Input non valido! Premi un tasto per continuare.", curses.color_pair(5))
+            # Nessun ridisegno: mostra solo l'errore sopra le istruzioni
+            safe_addstr(stdscr, height - 3, 2, "Input non valido!", CP_ERR)
+            stdscr.refresh()
+            redraw = False
 
-def rename_feed_ui(stdscr, db_name):
+def rename_feed_ui(stdscr, db_name, feeds):
     """
     Interfaccia per rinominare un feed RSS.
     """
-    conn = sqlite3.connect(db_name)
-    c = conn.cursor()
-    c.execute('SELECT id, name, url FROM sources ORDER BY name ASC')
-    feeds = c.fetchall()
-    conn.close()
-
     if not feeds:
-        show_message(stdscr, "Nessun feed RSS presente da rinominare.", curses.color_pair(5))
+        show_message(stdscr, "Nessun feed RSS presente da rinominare.", CP_ERR)
         return
 
     page = 0
     feeds_per_page = 10  # Numero di feed per pagina
     total_pages = (len(feeds) + feeds_per_page - 1) // feeds_per_page
 
+    pad = None
+    redraw = True
     while True:
-        stdscr.clear()
-        height, width = stdscr.getmaxyx()
-        stdscr.border()
-        # Titolo
-        title_text = f" Rinomina un Feed RSS (Pagina {page + 1}/{total_pages}) "
-        stdscr.attron(curses.color_pair(6) | curses.A_BOLD)
-        stdscr.addstr(0, max((width - len(title_text)) // 2, 0), title_text)
-        stdscr.attroff(curses.color_pair(6) | curses.A_BOLD)
-
         start = page * feeds_per_page
         end = start + feeds_per_page
         current_feeds = feeds[start:end]
 
-        y_offset = 2
-        for idx, (feed_id, name, url) in enumerate(current_feeds, start=1):
-            line_text = f"{start + idx}. Nome: {name} | URL: {url}"
-            safe_addstr(stdscr, y_offset, 2, line_text, curses.color_pair(1))
-            y_offset += 1
-
-        # Istruzioni per la navigazione
-        navigation = "Premi il numero del feed da rinominare, 'n' per pagina successiva, 'p' per precedente, 'q' per tornare indietro."
-        safe_addstr(stdscr, height - 2, 2, navigation, curses.color_pair(3))
-        stdscr.refresh()
+        if pad is None:
+            # Le righe vengono formattate nel pad solo quando la lista cambia
+            height, width = stdscr.getmaxyx()
+            lines = [f"{idx}. Nome: {name} | URL: {url}" for idx, (feed_id, name, url) in enumerate(feeds, start=1)]
+            pad = build_list_pad(lines, feeds_per_page, width, CP_NORMAL)
+
+        if redraw:
+            stdscr.erase()
+            height, width = stdscr.getmaxyx()
+            stdscr.border()
+            # Titolo
+            title_text = f" Rinomina un Feed RSS (Pagina {page + 1}/{total_pages}) "
+            stdscr.attron(CP_TITLE_BOLD)
+            stdscr.addstr(0, max((width - len(title_text)) // 2, 0), title_text)
+            stdscr.attroff(CP_TITLE_BOLD)
+
+            # Istruzioni per la navigazione
+            navigation = "Premi il numero del feed da rinominare, 'n' per pagina successiva, 'p' per precedente, 'q' per tornare indietro."
+            safe_addstr(stdscr, height - 2, 2, navigation, CP_PROMPT)
+            refresh_list_page(stdscr, pad, page, feeds_per_page)
+        redraw = True
 
         key = stdscr.getch()
         if key == ord('q'):
@@ -1111,10 +1384,18 @@ def rename_feed_ui(stdscr, db_name):
                 # Chiede il nuovo nome
                 new_name = get_user_input(stdscr, "Inserisci il nuovo nome per il feed:", width)
                 if new_name:
-                    update_source_name(db_name, selected_feed_id, new_name)
-                    show_message(stdscr, f"Feed '{selected_name}' rinominato in '{new_name}'.", curses.color_pair(2))
+                    with db_transaction(db_name) as conn:
+                        update_source_name(conn, selected_feed_id, new_name)
+                    # Aggiorna la lista condivisa mantenendo l'ordinamento per nome
+                    feeds[start + selection] = (selected_feed_id, new_name, selected_url)
+                    feeds.sort(key=lambda feed: feed[1])
+                    pad = None
+                    show_message(stdscr, f"Feed '{selected_name}' rinominato in '{new_name}'.", CP_OK)
         else:
-            show_message(stdscr, "Input non valido! Premi un tasto per continuare.", curses.color_pair(5))
+            # Nessun ridisegno: mostra solo l'errore sopra le istruzioni
+            safe_addstr(stdscr, height - 3, 2, "Input non valido!", CP_ERR)
+            stdscr.refresh()
+            redraw = False
 
 def get_user_input(stdscr, prompt, width):
     """
@@ -1124,7 +1405,7 @@ def get_user_input(stdscr, prompt, width):
     stdscr.clear()
     height, _ = stdscr.getmaxyx()
     stdscr.border()
-    safe_addstr(stdscr, height//2 - 1, 2, prompt, curses.color_pair(3))
+    safe_addstr(stdscr, height//2 - 1, 2, prompt, CP_PROMPT)
     stdscr.refresh()
     input_bytes = stdscr.getstr(height//2, 2, width - 4)
     curses.noecho()
@@ -1144,7 +1425,7 @@ def confirm_action(stdscr, message):
         stdscr.clear()
         height, width = stdscr.getmaxyx()
         stdscr.border()
-        safe_addstr(stdscr, height//2 - 1, 2, message + " (y/n): ", curses.color_pair(3))
+        safe_addstr(stdscr, height//2 - 1, 2, message + " (y/n): ", CP_PROMPT)
         stdscr.refresh()
         key = stdscr.getch()
         if key in [ord('y'), ord('Y')]:
@@ -1161,7 +1442,7 @@ def add_feed_ui(stdscr):
     height, width = stdscr.getmaxyx()
     stdscr.border()
     prompt = "Inserisci l'URL del nuovo feed RSS: "
-    safe_addstr(stdscr, 2, 2, prompt, curses.color_pair(3))
+    safe_addstr(stdscr, 2, 2, prompt, CP_PROMPT)
     stdscr.refresh()
     feed_url_bytes = stdscr.getstr(3, 2, width - 4)
     curses.noecho()
@@ -1171,69 +1452,24 @@ def add_feed_ui(stdscr):
         if not feed_url:
             raise ValueError("L'URL del feed non può essere vuoto.")
         # Tenta di estrarre il titolo del feed
-        feed = feedparser.parse(feed_url)
-        if feed.bozo:
-            raise ValueError(f"Errore nel parsing del feed: {feed.bozo_exception}")
-        feed_title = feed.feed.get('title', 'Unnamed Feed')
-        source_id = save_source(DB_PATH, feed_title, feed_url)
+        feed_title = fetch_feed_title(feed_url)
+        with db_transaction(DB_PATH) as conn:
+            source_id = save_source(conn, feed_title, feed_url)
         add_feed(feed_url)  # Aggiungi al file feeds.txt
         success_msg = f"Feed '{feed_title}' aggiunto con successo!"
-        safe_addstr(stdscr, 5, 2, success_msg, curses.color_pair(2))
+        safe_addstr(stdscr, 5, 2, success_msg, CP_OK)
         logging.info(f"New feed added via UI: {feed_title} ({feed_url})")
     except Exception as e:
         err_msg = f"Errore nell'aggiunta del feed: {e}"
-        safe_addstr(stdscr, 5, 2, err_msg, curses.color_pair(5))
+        safe_addstr(stdscr, 5, 2, err_msg, CP_ERR)
         logging.error(f"Error adding feed via UI: {e}")
 
     # Istruzioni finali
     final_msg = "Premi un tasto per continuare."
-    safe_addstr(stdscr, 7, 2, final_msg, curses.color_pair(3))
+    safe_addstr(stdscr, 7, 2, final_msg, CP_PROMPT)
     stdscr.refresh()
     stdscr.getch()
 
-def archive_articles_ui(stdscr, db_name):
-    """
-    Interfaccia per archiviare gli articoli obsoleti.
-    Mostra una barra di avanzamento durante il processo di archiviazione.
-    """
-    stdscr.clear()
-    height, width = stdscr.getmaxyx()
-    progress_win = curses.newwin(7, width - 4, height//2 - 3, 2)
-    progress_win.border()
-    progress_win.refresh()
-
-    try:
-        # Archivia gli articoli
-        archive_old_articles(db_name, threshold_days=ARCHIVE_THRESHOLD_DAYS)
-        show_message(stdscr, "Archiviazione completata! Premi un tasto per continuare.", curses.color_pair(2))
-    except Exception as e:
-        logging.error(f"Error during archiving: {e}")
-        show_message(stdscr, f"Errore durante l'archiviazione: {e}", curses.color_pair(5))
-    finally:
-        progress_win.clear()
-        progress_win.refresh()
-
-def update_articles_ui(stdscr, db_name):
-    """
-    Interfaccia per aggiornare gli articoli scaricando eventuali nuovi articoli.
-    Mostra una barra di avanzamento e il feed corrente in elaborazione.
-    """
-    stdscr.clear()
-    height, width = stdscr.getmaxyx()
-    progress_win = curses.newwin(5, width - 4, height//2 - 2, 2)
-    progress_win.border()
-    progress_win.refresh()
-
-    try:
-        process_feeds(db_name, progress_win)
-        show_message(stdscr, "Aggiornamento completato! Premi un tasto per continuare.", curses.color_pair(2))
-    except Exception as e:
-        logging.error(f"Error during update: {e}")
-        show_message(stdscr, f"Errore durante l'aggiornamento: {e}", curses.color_pair(5))
-    finally:
-        progress_win.clear()
-        progress_win.refresh()
-
 def search_ui(stdscr, db_name):
     """
     Interfaccia per cercare articoli in base ai tag.
@@ -1244,7 +1480,7 @@ def search_ui(stdscr, db_name):
     height, width = stdscr.getmaxyx()
     stdscr.border()
     prompt = "Cerca Articoli per Tag (separati da virgola): "
-    safe_addstr(stdscr, 2, 2, prompt, curses.color_pair(3))
+    safe_addstr(stdscr, 2, 2, prompt, CP_PROMPT)
     stdscr.refresh()
     search_input_bytes = stdscr.getstr(3, 2, width - 4)
     curses.noecho()
@@ -1254,16 +1490,16 @@ def search_ui(stdscr, db_name):
     except UnicodeDecodeError:
         search_input = ''
 
-    search_tags = [tag.strip() for tag in search_input.split(',') if tag.strip()]
+    search_tags = split_tags(search_input)
     results = search_articles(db_name, search_tags)
 
     if not results:
         stdscr.clear()
         stdscr.border()
         no_result_msg = f"Nessun articolo trovato per i tag: {search_tags}"
-        safe_addstr(stdscr, 2, 2, no_result_msg, curses.color_pair(5))
+        safe_addstr(stdscr, 2, 2, no_result_msg, CP_ERR)
         instruction = "Premi un tasto per tornare indietro."
-        safe_addstr(stdscr, 4, 2, instruction, curses.color_pair(3))
+        safe_addstr(stdscr, 4, 2, instruction, CP_PROMPT)
         stdscr.refresh()
         stdscr.getch()
         return
@@ -1273,30 +1509,31 @@ def search_ui(stdscr, db_name):
     articles_per_page = 9  # Limitazione a 9 articoli per pagina
     total_pages = (len(results) + articles_per_page - 1) // articles_per_page
 
-    while True:
-        stdscr.clear()
-        stdscr.border()
-        # Titolo dei risultati
-        title_text = f" Risultati per {search_tags} (Pagina {page + 1}/{total_pages}) "
-        stdscr.attron(curses.color_pair(6) | curses.A_BOLD)
-        stdscr.addstr(0, max((width - len(title_text)) // 2, 0), title_text)
-        stdscr.attroff(curses.color_pair(6) | curses.A_BOLD)
+    # Le righe vengono formattate una sola volta nel pad, numerate 1-9 per pagina
+    lines = [f"{idx % articles_per_page + 1}. {title} ({published})"
+             for idx, (art_id, title, link, published) in enumerate(results)]
+    pad = build_list_pad(lines, articles_per_page, width, CP_NORMAL)
 
+    redraw = True
+    while True:
         start = page * articles_per_page
         end = start + articles_per_page
         current_results = results[start:end]
 
-        y_offset = 2
-        for idx, (art_id, title, link, published) in enumerate(current_results, start=1):
-            line_num = idx
-            line_text = f"{idx}. {title} ({published})"
-            safe_addstr(stdscr, y_offset, 2, line_text, curses.color_pair(1))
-            y_offset += 1
-
-        # Istruzioni per la navigazione
-        navigation = "Premi un numero (1-9) per leggere l'articolo, 'n' per pagina successiva, 'p' per precedente, 'q' per tornare indietro."
-        safe_addstr(stdscr, articles_per_page + 3, 2, navigation, curses.color_pair(3))
-        stdscr.refresh()
+        if redraw:
+            stdscr.erase()
+            stdscr.border()
+            # Titolo dei risultati
+            title_text = f" Risultati per {search_tags} (Pagina {page + 1}/{total_pages}) "
+            stdscr.attron(CP_TITLE_BOLD)
+            stdscr.addstr(0, max((width - len(title_text)) // 2, 0), title_text)
+            stdscr.attroff(CP_TITLE_BOLD)
+
+            # Istruzioni per la navigazione
+            navigation = "Premi un numero (1-9) per leggere l'articolo, 'n' per pagina successiva, 'p' per precedente, 'q' per tornare indietro."
+            safe_addstr(stdscr, articles_per_page + 3, 2, navigation, CP_PROMPT)
+            refresh_list_page(stdscr, pad, page, articles_per_page)
+        redraw = True
 
         key = stdscr.getch()
         if key == ord('q'):
@@ -1311,8 +1548,10 @@ def search_ui(stdscr, db_name):
                 article_id = current_results[selection][0]
                 show_article(stdscr, db_name, article_id)
         else:
-            # Mostra un messaggio di errore temporaneo
-            show_message(stdscr, "Input non valido! Premi un tasto per continuare.", curses.color_pair(5))
+            # Nessun ridisegno: mostra solo l'errore sotto le istruzioni
+            safe_addstr(stdscr, articles_per_page + 4, 2, "Input non valido!", CP_ERR)
+            stdscr.refresh()
+            redraw = False
 
 def search_articles(db_name, search_tags):
     """
@@ -1322,31 +1561,22 @@ def search_articles(db_name, search_tags):
     if not search_tags:
         return []
 
-    conn = sqlite3.connect(db_name)
+    conn = get_connection(db_name)
     c = conn.cursor()
-    placeholders = ','.join(['?'] * len(search_tags))
-    
-    # Trova l'id di ogni tag cercato
-    c.execute(f'SELECT id FROM tags WHERE tag IN ({placeholders})', search_tags)
-    tag_ids = [row[0] for row in c.fetchall()]
-    
-    if not tag_ids:
-        conn.close()
-        return []
-    
-    # Cerchiamo gli articoli che hanno TUTTI i tag cercati
-    query = f'''
+    # Un'unica query: 'wanted' contiene gli id dei tag cercati, poi selezioniamo
+    # gli articoli che li hanno TUTTI
+    c.execute('''
+        WITH wanted AS (
+            SELECT id FROM tags WHERE tag IN (SELECT value FROM json_each(?))
+        )
         SELECT articles.id, articles.title, articles.link, articles.published
         FROM articles
         JOIN article_tags ON articles.id = article_tags.article_id
-        WHERE article_tags.tag_id IN ({','.join(['?'] * len(tag_ids))})
+        WHERE article_tags.tag_id IN (SELECT id FROM wanted)
         GROUP BY articles.id
-        HAVING COUNT(DISTINCT article_tags.tag_id) = ?
-    '''
-    
-    c.execute(query, (*tag_ids, len(tag_ids)))
+        HAVING COUNT(DISTINCT article_tags.tag_id) = (SELECT COUNT(*) FROM wanted)
+    ''', (json.dumps(search_tags),))
     results = c.fetchall()
-    conn.close()
     return results
 
 def show_message(stdscr, message, attr=0):
@@ -1367,12 +1597,14 @@ def show_message(stdscr, message, attr=0):
 # SAFE ADDSTR PER EVITARE ERRORI CURSES
 # ----------------------------------------------------------------------------
 
-def safe_addstr(stdscr, y, x, text, attr=0):
+def safe_addstr(stdscr, y, x, text, attr=0, size=None):
     """
     Aggiunge la stringa 'text' alla finestra curses tronandola 
     se supera la larghezza disponibile. Evita l'errore "_curses.error: addwstr() returned ERR".
+    Nei cicli di disegno il chiamante può passare in 'size' le dimensioni (altezza, larghezza)
+    già lette con getmaxyx(), evitando di interrogare curses a ogni riga.
     """
-    max_y, max_x = stdscr.getmaxyx()
+    max_y, max_x = size or stdscr.getmaxyx()
     if y < 0 or y >= max_y:
         return  # Fuori dallo schermo verticalmente
     truncated_text = text[:max_x - x - 1]  # Tronca se troppo lunga
@@ -1381,6 +1613,37 @@ def safe_addstr(stdscr, y, x, text, attr=0):
     except curses.error:
         pass  # Se ci sono ancora problemi, ignoriamo l'errore
 
+# ----------------------------------------------------------------------------
+# PAD PER LE LISTE PAGINATE
+# ----------------------------------------------------------------------------
+
+def build_list_pad(lines, items_per_page, width, attr=0):
+    """
+    Pre-renderizza tutte le righe di una lista paginata in un pad curses.
+    Il pad ha sempre un numero di righe multiplo della pagina, così anche
+    l'ultima pagina copre l'intera area e non lascia righe della precedente.
+    """
+    total_pages = max((len(lines) + items_per_page - 1) // items_per_page, 1)
+    pad = curses.newpad(total_pages * items_per_page + 1, width)
+    for y, line in enumerate(lines):
+        try:
+            pad.addstr(y, 0, line[:width - 5], attr)
+        except curses.error:
+            pass
+    return pad
+
+def refresh_list_page(stdscr, pad, page, items_per_page, top=2):
+    """
+    Copia sullo schermo la porzione del pad relativa alla pagina corrente.
+    """
+    height, width = stdscr.getmaxyx()
+    bottom = min(top + items_per_page - 1, height - 3)
+    if bottom < top:
+        return
+    stdscr.noutrefresh()
+    pad.noutrefresh(page * items_per_page, 0, top, 2, bottom, width - 3)
+    curses.doupdate()
+
 # ----------------------------------------------------------------------------
 # FUNZIONE PER L'ARCHIVIAZIONE NON INTERATTIVA
 # ----------------------------------------------------------------------------
@@ -1414,10 +1677,10 @@ def update_articles_ui(stdscr, db_name):
 
     try:
         process_feeds(db_name, progress_win)
-        show_message(stdscr, "Aggiornamento completato! Premi un tasto per continuare.", curses.color_pair(2))
+        show_message(stdscr, "Aggiornamento completato! Premi un tasto per continuare.", CP_OK)
     except Exception as e:
         logging.error(f"Error during update: {e}")
-        show_message(stdscr, f"Errore durante l'aggiornamento: {e}", curses.color_pair(5))
+        show_message(stdscr, f"Errore durante l'aggiornamento: {e}", CP_ERR)
     finally:
         progress_win.clear()
         progress_win.refresh()
@@ -1440,10 +1703,10 @@ def archive_articles_ui(stdscr, db_name):
     try:
         # Archivia gli articoli
         archive_old_articles(db_name, threshold_days=ARCHIVE_THRESHOLD_DAYS)
-        show_message(stdscr, "Archiviazione completata! Premi un tasto per continuare.", curses.color_pair(2))
+        show_message(stdscr, "Archiviazione completata! Premi un tasto per continuare.", CP_OK)
     except Exception as e:
         logging.error(f"Error during archiving: {e}")
-        show_message(stdscr, f"Errore durante l'archiviazione: {e}", curses.color_pair(5))
+        show_message(stdscr, f"Errore durante l'archiviazione: {e}", CP_ERR)
     finally:
         progress_win.clear()
         progress_win.refresh()
@@ -1452,6 +1715,9 @@ def archive_articles_ui(stdscr, db_name):
 # FUNZIONE PER AGGIORNARE LA PROGRESS BAR
 # ----------------------------------------------------------------------------
 
+# Ultimo stato disegnato dalla progress bar, per evitare ridisegni identici
+PROGRESS_LAST = {'win': None, 'state': None}
+
 def update_progress_bar(win, current, total, message=""):
     """
     Aggiorna una barra di avanzamento in una finestra curses.
@@ -1461,11 +1727,18 @@ def update_progress_bar(win, current, total, message=""):
     :param total: Il totale del progresso (numero)
     :param message: Messaggio da mostrare accanto alla barra
     """
-    win.clear()
-    win.border()
     # Calcola la larghezza della barra di avanzamento
     bar_width = win.getmaxyx()[1] - 4  # Lascia spazio per i bordi
     progress = int((current / total) * bar_width)
+    # Ridisegna solo se la barra o il messaggio sono cambiati rispetto all'ultimo aggiornamento
+    state = (progress, message)
+    if PROGRESS_LAST['win'] is win and PROGRESS_LAST['state'] == state:
+        return
+    PROGRESS_LAST['win'] = win
+    PROGRESS_LAST['state'] = state
+    # erase() non forza il ridisegno completo del terminale come clear()
+    win.erase()
+    win.border()
     bar = "[" + "#" * progress + "-" * (bar_width - progress) + "]"
     # Mostra la barra di avanzamento
     win.addstr(2, 2, bar)
@@ -1497,24 +1770,27 @@ def main():
     os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
     os.makedirs(ARCHIVE_DIR, exist_ok=True)
 
-    # Inizializza il database (crea le tabelle se non esistono)
-    initialize_db()
-
-    if args.update and args.archive:
-        # Esegui entrambe le operazioni
-        perform_archiving(DB_PATH)
-        curses.wrapper(update_articles_ui, DB_PATH)
-        print("Database aggiornato e articoli archiviati con successo.")
-    elif args.update:
-        # Avvia l'interfaccia temporanea per mostrare la progress bar
-        curses.wrapper(update_articles_ui, DB_PATH)
-        print("Database aggiornato con successo.")
-    elif args.archive:
-        # Esegui l'archiviazione senza interfaccia utente
-        perform_archiving(DB_PATH)
-    else:
-        # Avvia l'interfaccia utente curses
-        curses.wrapper(ui_main, DB_PATH)
+    # La connessione persistente viene chiusa in modo deterministico all'uscita,
+    # anche in caso di eccezione (con WAL la chiusura esegue anche il checkpoint)
+    with contextlib.closing(get_connection(DB_PATH)):
+        # Inizializza il database (crea le tabelle se non esistono)
+        initialize_db()
+
+        if args.update and args.archive:
+            # Esegui entrambe le operazioni
+            perform_archiving(DB_PATH)
+            curses.wrapper(update_articles_ui, DB_PATH)
+            print("Database aggiornato e articoli archiviati con successo.")
+        elif args.update:
+            # Avvia l'interfaccia temporanea per mostrare la progress bar
+            curses.wrapper(update_articles_ui, DB_PATH)
+            print("Database aggiornato con successo.")
+        elif args.archive:
+            # Esegui l'archiviazione senza interfaccia utente
+            perform_archiving(DB_PATH)
+        else:
+            # Avvia l'interfaccia utente curses
+            curses.wrapper(ui_main, DB_PATH)
 
 if __name__ == "__main__":
     main()